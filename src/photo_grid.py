@@ -3,17 +3,39 @@
 
 """Photo Grid - create print-ready photo grids using ImageMagick montage."""
 
-import math, subprocess, shutil, tempfile
+import math, os, shutil, tempfile, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import gi
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Adw, Gtk, Gio, GLib  # noqa: E402
+gi.require_version("GdkPixbuf", "2.0")
+from gi.repository import Adw, Gtk, Gdk, GdkPixbuf, Gio, GLib, GObject  # noqa: E402
+
+try:
+    import img2pdf
+except ImportError:  # optional - PDFs are then combined by ImageMagick
+    img2pdf = None
 
 APP_ID = "io.github.photogrid"
 
+# Thumbnails are decoded at this size (px), then shown at 48 px
+THUMB_SIZE = 96
+
+# Preview pages are decoded to fit this size (px); print-DPI pages are
+# far larger than the window
+PREVIEW_SIZE = 1600
+
+# Picked files added to the list per main-loop idle callback
+ADD_BATCH = 20
+
+# Bytes of ImageMagick stderr read back for error messages
+STDERR_TAIL = 4096
+
 # Paper sizes in inches (width x height, portrait orientation)
 PAPERS = {
     "4 x 6 in": (4, 6),
@@ -40,14 +62,155 @@ LAYOUTS = {
 }
 LAYOUT_NAMES = list(LAYOUTS.keys())
 
+# Image types offered in the file dialog and accepted when adding
+IMAGE_MIMES = ("image/jpeg", "image/png", "image/webp", "image/tiff", "image/bmp")
+IMAGE_SUFFIXES = ("jpg", "jpeg", "png", "webp", "tif", "tiff", "bmp")
+# Leading bytes read to sniff a picked file's content type
+SNIFF_BYTES = 512
+
+
+def _is_supported_image(path, head=None):
+    """Check that a file's name (and header, if given) is one of IMAGE_MIMES.
+
+    The name-only check does no I/O, so it runs on the main loop; the header
+    check runs with the thumbnail decode on a pool thread. Neither catches a
+    file whose header is intact but whose data is corrupt.
+    """
+    ctype, _uncertain = Gio.content_type_guess(path, head)
+    return any(Gio.content_type_is_a(ctype, mime) for mime in IMAGE_MIMES)
+
+
+def _render_cpus():
+    """CPUs spawned renders may use: all of ours but one, kept for the UI.
+
+    Returns None where CPU affinity isn't supported.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    return cpus[:-1] if len(cpus) > 1 else cpus
+
+
+def _deprioritize(proc):
+    """Keep a spawned render from starving the UI thread.
+
+    The child is reniced to 10 above our own niceness (capped at 19) and
+    limited to _render_cpus(). This is done
+    from the parent right after the spawn, so no Python runs in the forked
+    child.
+    """
+    pid = proc.get_identifier()
+    if pid is None:  # already exited
+        return
+    pid = int(pid)
+    try:
+        nice = min(19, os.getpriority(os.PRIO_PROCESS, 0) + 10)
+        os.setpriority(os.PRIO_PROCESS, pid, nice)
+    except OSError:
+        pass  # exited in the meantime
+    if cpus := _render_cpus():
+        try:
+            os.sched_setaffinity(pid, cpus)
+        except OSError:
+            pass  # exited in the meantime
+
+
+@lru_cache(maxsize=32)
+def _montage_args(
+    cell_w,
+    cell_h,
+    border,
+    spacing,
+    bg,
+    border_color,
+    fill,
+    canvas_w,
+    canvas_h,
+    dpi,
+    preview,
+    scratch,
+):
+    """Return the (leading, per-row, per-page) magick flags for settings.
+
+    Every page of a render shares them, so they are built once as tuples.
+    """
+    cell = f"{cell_w}x{cell_h}"
+    tile_w = cell_w + 2 * (border + spacing)
+    tile_h = cell_h + 2 * (border + spacing)
+
+    # pages render in parallel, so keep each process single-threaded; the
+    # jpeg:size hint lets libjpeg decode large photos at a reduced DCT
+    # scale that is still at least twice the cell size
+    head = ("-limit", "thread", "1")
+    head += ("-define", f"jpeg:size={2 * cell_w}x{2 * cell_h}")
+
+    # previews use -thumbnail: a cheaper filter that also strips profiles
+    resize = "-thumbnail" if preview else "-resize"
+    if fill:
+        row = (resize, f"{cell}^", "-gravity", "center", "-extent", cell)
+    else:
+        row = (resize, cell)
+    row += ("-bordercolor", border_color, "-border", str(border))
+    row += ("-background", bg, "-gravity", "center")
+    row += ("-extent", f"{tile_w}x{tile_h}", "+append")
+
+    page = (
+        "-background",
+        bg,
+        "-gravity",
+        "northwest",
+        "-append",
+        "-gravity",
+        "center",
+        "-extent",
+        f"{canvas_w}x{canvas_h}",
+        "-units",
+        "PixelsPerInch",
+        "-density",
+        str(dpi),
+    )
+    if preview:
+        page += ("-strip",)
+    if preview or scratch:
+        # PNG quality 10 = zlib level 1, no row filtering - these files are
+        # read back once, so fast beats small
+        page += ("-quality", "10")
+    return head, row, page
+
+
+class ImageItem(GObject.Object):
+    """A selected image, as stored in the image list model."""
+
+    path = GObject.Property(type=str)
+    # row title, resolved once rather than on every rebind
+    basename = GObject.Property(type=str)
+    # decoded thumbnail, None until the worker has produced it
+    texture = GObject.Property(type=Gdk.Texture)
+
 
 class PhotoGridWindow(Adw.ApplicationWindow):
     def __init__(self, **kwargs):
         super().__init__(
             **kwargs, default_width=900, default_height=750, title="Photo Grid"
         )
-        self.images: list[str] = []
+        # path -> list item, in insertion order
+        self.images: dict[str, ImageItem] = {}
         self._preview_win = None
+        self._preview_save_btn = None
+        self._busy_toast = None
+        # (render key, page paths, tmpdir) of the last full-quality preview
+        self._render_cache = None
+        self._thumb_cache: dict[tuple[str, float], Gdk.Texture] = {}
+        # PyGObject drops the GIL inside the C decoders, so threads run the
+        # decodes in parallel
+        self._thumb_pool = ThreadPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2),
+            thread_name_prefix="thumbnail",
+        )
+        self._pending_add: deque[str] = deque()
+        self._add_source = 0
+        self._skipped_count = 0
+        self._skipped_toast = None
 
         # -- header bar --
         header = Adw.HeaderBar()
@@ -66,14 +229,23 @@ class PhotoGridWindow(Adw.ApplicationWindow):
             description="Click + to add images",
         )
 
-        self.listbox = Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE)
-        self.listbox.add_css_class("boxed-list")
+        # rows are recycled as the list scrolls, so only the visible
+        # images have widgets
+        self.store = Gio.ListStore.new(ImageItem)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_row_setup)
+        factory.connect("bind", self._on_row_bind)
+        factory.connect("unbind", self._on_row_unbind)
+        self.listview = Gtk.ListView(
+            model=Gtk.NoSelection.new(self.store), factory=factory
+        )
+        self.listview.add_css_class("card")
 
         img_scroll = Gtk.ScrolledWindow(hscrollbar_policy=Gtk.PolicyType.NEVER)
         img_scroll.set_min_content_height(120)
         img_scroll.set_max_content_height(220)
         img_scroll.set_propagate_natural_height(True)
-        img_scroll.set_child(self.listbox)
+        img_scroll.set_child(self.listview)
 
         self.img_stack = Gtk.Stack()
         self.img_stack.add_named(self.status, "empty")
@@ -103,6 +275,12 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         )
         page_group.add(self.pdf_row)
 
+        self.full_preview_row = Adw.SwitchRow(
+            title="Full-Quality Preview",
+            subtitle="Preview at print DPI so saving can reuse it",
+        )
+        page_group.add(self.full_preview_row)
+
         # -- layout --
         layout_group = Adw.PreferencesGroup(title="Layout")
 
@@ -163,18 +341,18 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         btn_box.set_margin_top(4)
         btn_box.set_margin_bottom(8)
 
-        preview_btn = Gtk.Button(label="Preview")
-        preview_btn.add_css_class("pill")
-        preview_btn.set_size_request(200, -1)
-        preview_btn.connect("clicked", self._on_preview)
-        btn_box.append(preview_btn)
+        self.preview_btn = Gtk.Button(label="Preview")
+        self.preview_btn.add_css_class("pill")
+        self.preview_btn.set_size_request(200, -1)
+        self.preview_btn.connect("clicked", self._on_preview)
+        btn_box.append(self.preview_btn)
 
-        gen_btn = Gtk.Button(label="Create Grid")
-        gen_btn.add_css_class("suggested-action")
-        gen_btn.add_css_class("pill")
-        gen_btn.set_size_request(200, -1)
-        gen_btn.connect("clicked", self._on_generate)
-        btn_box.append(gen_btn)
+        self.gen_btn = Gtk.Button(label="Create Grid")
+        self.gen_btn.add_css_class("suggested-action")
+        self.gen_btn.add_css_class("pill")
+        self.gen_btn.set_size_request(200, -1)
+        self.gen_btn.connect("clicked", self._on_generate)
+        btn_box.append(self.gen_btn)
 
         # -- assemble --
         scroll = Gtk.ScrolledWindow(vexpand=True)
@@ -196,6 +374,7 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         toolbar.add_top_bar(header)
         toolbar.set_content(self.toast_overlay)
         self.set_content(toolbar)
+        self.connect("close-request", self._on_close_request)
 
     # -- file handling -------------------------------------------------------
 
@@ -203,14 +382,11 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         dlg = Gtk.FileDialog(title="Select Images")
         f = Gtk.FileFilter()
         f.set_name("Images")
-        for mime in (
-            "image/jpeg",
-            "image/png",
-            "image/webp",
-            "image/tiff",
-            "image/bmp",
-        ):
+        for mime in IMAGE_MIMES:
             f.add_mime_type(mime)
+        # suffixes too, for mounts that can't report a content type
+        for suffix in IMAGE_SUFFIXES:
+            f.add_suffix(suffix)
         filters = Gio.ListStore.new(Gtk.FileFilter)
         filters.append(f)
         dlg.set_filters(filters)
@@ -223,38 +399,183 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         except GLib.Error:
             return
         for i in range(files.get_n_items()):
-            path = files.get_item(i).get_path()
-            if path and path not in self.images:
-                self.images.append(path)
-                self._add_image_row(path)
+            if path := files.get_item(i).get_path():
+                self._pending_add.append(path)
+        # add in small batches so the window keeps painting between them
+        if self._pending_add and not self._add_source:
+            self._add_source = GLib.idle_add(
+                self._drain_pending_add, priority=GLib.PRIORITY_DEFAULT_IDLE
+            )
+
+    def _drain_pending_add(self):
+        new_items = []
+        skipped = 0
+        for _ in range(min(ADD_BATCH, len(self._pending_add))):
+            path = self._pending_add.popleft()
+            if path in self.images:
+                continue
+            if not _is_supported_image(path):
+                skipped += 1
+                continue
+            item = ImageItem(path=path, basename=os.path.basename(path))
+            self.images[path] = item
+            new_items.append(item)
+        self.store.splice(self.store.get_n_items(), 0, new_items)
+        for item in new_items:
+            self._load_thumbnail(item)
         self._update_visibility()
+        if skipped:
+            self._report_skipped(skipped)
+        if self._pending_add:
+            return GLib.SOURCE_CONTINUE
+        self._add_source = 0
+        return GLib.SOURCE_REMOVE
+
+    def _report_skipped(self, n):
+        """Count skipped files into one toast, updated while it is shown."""
+        self._skipped_count += n
+        title = f"Skipped {self._skipped_count} unsupported file(s)"
+        if self._skipped_toast:
+            self._skipped_toast.set_title(title)
+            return
+        self._skipped_toast = Adw.Toast(title=title)
+        self._skipped_toast.connect("dismissed", self._on_skipped_dismissed)
+        self.toast_overlay.add_toast(self._skipped_toast)
 
-    def _add_image_row(self, path):
-        row = Adw.ActionRow(title=Path(path).name, subtitle=path)
+    def _on_skipped_dismissed(self, toast):
+        if toast is self._skipped_toast:
+            self._skipped_toast = None
+            self._skipped_count = 0
+
+    def _on_row_setup(self, _factory, list_item):
+        row = Adw.ActionRow()
         # thumbnail
-        thumb = Gtk.Image.new_from_file(path)
-        thumb.set_pixel_size(48)
-        row.add_prefix(thumb)
+        row.thumb = Gtk.Image(pixel_size=48)
+        row.add_prefix(row.thumb)
         # remove button
         remove_btn = Gtk.Button(
             icon_name="user-trash-symbolic", valign=Gtk.Align.CENTER
         )
         remove_btn.add_css_class("flat")
-        remove_btn.connect("clicked", self._on_remove_image, path, row)
+        remove_btn.connect("clicked", self._on_remove_image, list_item)
         row.add_suffix(remove_btn)
-        self.listbox.append(row)
+        list_item.set_child(row)
+
+    def _on_row_bind(self, _factory, list_item):
+        item = list_item.get_item()
+        row = list_item.get_child()
+        row.set_title(item.basename)
+        row.set_subtitle(item.path)
+        row.texture_handler = item.connect(
+            "notify::texture", self._on_item_texture, row.thumb
+        )
+        self._on_item_texture(item, None, row.thumb)
+
+    def _on_row_unbind(self, _factory, list_item):
+        row = list_item.get_child()
+        list_item.get_item().disconnect(row.texture_handler)
+
+    def _on_item_texture(self, item, _pspec, image):
+        if item.texture:
+            image.set_from_paintable(item.texture)
+        else:
+            image.set_from_icon_name("image-x-generic-symbolic")
+
+    def _load_thumbnail(self, item):
+        try:
+            key = (item.path, os.path.getmtime(item.path))
+        except OSError:
+            return
+        if tex := self._thumb_cache.get(key):
+            item.texture = tex
+        else:
+            self._thumb_pool.submit(self._decode_thumbnail, key, item)
+
+    def _decode_thumbnail(self, key, item):
+        """Sniff and decode one image on a pool thread; report to main loop."""
+        try:
+            with open(key[0], "rb") as f:
+                head = f.read(SNIFF_BYTES)
+        except OSError:
+            head = b""
+        if not head or not _is_supported_image(key[0], head):
+            GLib.idle_add(self._on_unsupported_image, item)
+            return
+        try:
+            pb = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                key[0], THUMB_SIZE, THUMB_SIZE, True
+            )
+        except GLib.Error:
+            return
+        tex = Gdk.Texture.new_for_pixbuf(pb.apply_embedded_orientation())
+        GLib.idle_add(self._on_thumb_ready, key, item, tex)
+
+    def _on_thumb_ready(self, key, item, tex):
+        self._thumb_cache[key] = tex
+        item.texture = tex
+        return GLib.SOURCE_REMOVE
+
+    def _load_preview_page(self):
+        path = self._preview_pages[self._preview_idx]
+        self._thumb_pool.submit(self._decode_preview, self._preview_win, path)
 
-    def _on_remove_image(self, _btn, path, row):
-        self.images.remove(path)
-        self.listbox.remove(row)
+    def _decode_preview(self, win, path):
+        """Decode one preview page on a pool thread, scaled to PREVIEW_SIZE."""
+        try:
+            _fmt, w, h = GdkPixbuf.Pixbuf.get_file_info(path)
+            if w > PREVIEW_SIZE or h > PREVIEW_SIZE:
+                pb = GdkPixbuf.Pixbuf.new_from_file_at_scale(
+                    path, PREVIEW_SIZE, PREVIEW_SIZE, True
+                )
+            else:
+                pb = GdkPixbuf.Pixbuf.new_from_file(path)
+        except GLib.Error:
+            return
+        tex = Gdk.Texture.new_for_pixbuf(pb)
+        GLib.idle_add(self._on_preview_page_ready, win, path, tex)
+
+    def _on_preview_page_ready(self, win, path, tex):
+        # drop pages for a closed window, or one the user has paged past
+        if win is self._preview_win and path == self._preview_pages[self._preview_idx]:
+            self._preview_picture.set_paintable(tex)
+        return GLib.SOURCE_REMOVE
+
+    def _on_unsupported_image(self, item):
+        # listed on its name, rejected once its header was sniffed
+        if self.images.get(item.path) is item:
+            self._remove_item(item)
+            self._report_skipped(1)
+        return GLib.SOURCE_REMOVE
+
+    def _on_remove_image(self, _btn, list_item):
+        if item := list_item.get_item():
+            self._remove_item(item)
+
+    def _remove_item(self, item):
+        self.images.pop(item.path, None)
+        found, pos = self.store.find(item)
+        if found:
+            self.store.remove(pos)
         self._update_visibility()
 
     def _on_clear(self, _btn):
+        self._pending_add.clear()
+        if self._skipped_toast:
+            self._skipped_toast.dismiss()
+        self._skipped_toast = None
+        self._skipped_count = 0
         self.images.clear()
-        while row := self.listbox.get_row_at_index(0):
-            self.listbox.remove(row)
+        self.store.remove_all()
         self._update_visibility()
 
+    def _on_close_request(self, _win):
+        # don't keep the process alive decoding thumbnails nobody will see
+        self._thumb_pool.shutdown(wait=False, cancel_futures=True)
+        if self._render_cache:
+            shutil.rmtree(self._render_cache[2], ignore_errors=True)
+            self._render_cache = None
+        return False
+
     def _update_visibility(self):
         if self.images:
             self.img_stack.set_visible_child_name("list")
@@ -263,7 +584,7 @@ class PhotoGridWindow(Adw.ApplicationWindow):
 
     # -- grid generation -----------------------------------------------------
 
-    def _gather_settings(self, dpi_override=None):
+    def _gather_settings(self, dpi_override=None, preview=False):
         """Read all UI values and compute montage parameters."""
         paper_name = PAPER_NAMES[self.paper_row.get_selected()]
         pw, ph = PAPERS[paper_name]
@@ -293,15 +614,14 @@ class PhotoGridWindow(Adw.ApplicationWindow):
             cell_h = (canvas_h - 2 * margin - rows * 2 * (border + spacing)) // rows
             cell_w = max(cell_w, 64)
             cell_h = max(cell_h, 64)
-            tile = f"{cols}x{rows}"
         else:
-            # contact sheet - let montage decide tile, use reasonable cell
+            # contact sheet - grid sized per page, use reasonable cell
             cell_w = (canvas_w - 2 * margin) // 6
             cell_h = cell_w
-            tile = ""
 
         return {
-            "tile": tile,
+            "cols": cols,
+            "rows": rows,
             "cell_w": cell_w,
             "cell_h": cell_h,
             "border": border,
@@ -314,13 +634,20 @@ class PhotoGridWindow(Adw.ApplicationWindow):
             "dpi": dpi,
             "fill": fill,
             "pdf": pdf,
+            "preview": preview,
+            # page is an intermediate PNG, not the user's output
+            "scratch": False,
         }
 
     def _check_ready(self):
         if not self.images:
             self.toast_overlay.add_toast(Adw.Toast(title="Add some images first"))
             return False
-        if not shutil.which("magick"):
+        app = self.get_application()
+        if not (app.magick_path and os.path.exists(app.magick_path)):
+            # moved, removed or installed since startup
+            app.magick_path = shutil.which("magick")
+        if not app.magick_path:
             self.toast_overlay.add_toast(
                 Adw.Toast(title="ImageMagick not found - install it first")
             )
@@ -329,83 +656,186 @@ class PhotoGridWindow(Adw.ApplicationWindow):
 
     def _chunk_images(self, s):
         """Split images into per-page chunks based on grid layout."""
-        if s["tile"]:
-            cols, rows = (int(x) for x in s["tile"].split("x"))
-            per_page = cols * rows
-            return [
-                self.images[i : i + per_page]
-                for i in range(0, len(self.images), per_page)
-            ]
-        return [self.images]  # contact sheet = one page
-
-    def _run_montage(self, imgs, s, dest):
-        """Run montage for one page \u2192 center on canvas \u2192 save."""
-        cmd1 = ["magick", "montage"] + imgs
-        if s["fill"]:
-            cmd1 += [
-                "-resize",
-                f"{s['cell_w']}x{s['cell_h']}^",
-                "-gravity",
-                "center",
-                "-extent",
-                f"{s['cell_w']}x{s['cell_h']}",
-            ]
-            cmd1 += ["-geometry", f"+{s['spacing']}+{s['spacing']}"]
-        else:
-            cmd1 += [
-                "-geometry",
-                f"{s['cell_w']}x{s['cell_h']}+{s['spacing']}+{s['spacing']}",
-            ]
-        if s["tile"]:
-            cmd1 += ["-tile", s["tile"]]
-        cmd1 += ["-border", str(s["border"])]
-        cmd1 += ["-bordercolor", s["border_color"]]
-        cmd1 += ["-background", s["bg"]]
-        cmd1 += ["png:-"]
-
-        cmd2 = [
-            "magick",
-            "-",
-            "-gravity",
-            "center",
-            "-background",
+        images = list(self.images)
+        if s["cols"] and s["rows"]:
+            per_page = s["cols"] * s["rows"]
+            return [images[i : i + per_page] for i in range(0, len(images), per_page)]
+        return [images]  # contact sheet = one page
+
+    def _run_montage(self, imgs, s, dest, callback):
+        """Lay out one page of tiles, center it on the canvas and save it.
+
+        The grid is built row by row with parenthesised sub-images and
+        appended, so the whole page is rendered by a single magick process.
+        """
+        head_args, row_args, page_args = _montage_args(
+            s["cell_w"],
+            s["cell_h"],
+            s["border"],
+            s["spacing"],
             s["bg"],
-            "-extent",
-            f"{s['canvas_w']}x{s['canvas_h']}",
-            "-units",
-            "PixelsPerInch",
-            "-density",
-            str(s["dpi"]),
-            dest,
-        ]
-
-        r1 = subprocess.run(cmd1, capture_output=True, check=True)
-        subprocess.run(cmd2, input=r1.stdout, capture_output=True, check=True)
-
-    def _run_all_pages(self, s, dest_pattern):
-        """Generate all pages. Returns list of output file paths."""
+            s["border_color"],
+            s["fill"],
+            s["canvas_w"],
+            s["canvas_h"],
+            s["dpi"],
+            s["preview"],
+            s["scratch"],
+        )
+        # contact sheet - roughly square grid, like montage's auto tile
+        cols = s["cols"] or math.ceil(math.sqrt(len(imgs)))
+
+        cmd = [self.get_application().magick_path, *head_args]
+        for i in range(0, len(imgs), cols):
+            cmd += ["(", *imgs[i : i + cols], *row_args, ")"]
+        cmd += [*page_args, dest]
+
+        self._spawn(cmd, callback)
+
+    def _spawn(self, argv, callback, *args):
+        """Run argv without blocking the main loop.
+
+        callback(err, *args) is called from the main loop once the process
+        has exited; err is None on success, otherwise the last line of its
+        stderr output.
+        """
+        # stderr goes to an unlinked temp file, only read back on failure
+        err = tempfile.TemporaryFile()
+        launcher = Gio.SubprocessLauncher.new(Gio.SubprocessFlags.STDOUT_SILENCE)
+        launcher.take_stderr_fd(os.dup(err.fileno()))
+        try:
+            proc = launcher.spawnv(argv)
+        except GLib.Error as e:
+            err.close()
+            GLib.idle_add(callback, e.message, *args)
+            return
+        _deprioritize(proc)
+        proc.wait_async(None, self._on_spawn_done, (err, callback, args))
+
+    def _on_spawn_done(self, proc, result, data):
+        err, callback, args = data
+        with err:
+            try:
+                proc.wait_finish(result)
+            except GLib.Error as e:
+                callback(e.message, *args)
+                return
+            if proc.get_successful():
+                callback(None, *args)
+                return
+            size = err.seek(0, os.SEEK_END)
+            err.seek(max(0, size - STDERR_TAIL))
+            tail = err.read().decode("utf-8", errors="replace")
+        lines = tail.strip().splitlines()
+        callback(lines[-1] if lines else "ImageMagick failed", *args)
+
+    def _run_pages(self, jobs, s, callback, *args):
+        """Render (chunk, dest) jobs, keeping one magick per render CPU busy.
+
+        callback(err, *args) is called once every started page has finished;
+        no new pages are started after the first failure.
+        """
+        pending = iter(jobs)
+        running = 0
+        errors = []
+
+        def start_next():
+            nonlocal running
+            job = next(pending, None)
+            if job is None:
+                return False
+            running += 1
+            self._run_montage(*job, s, on_page_done)
+            return True
+
+        def on_page_done(err):
+            nonlocal running
+            running -= 1
+            if err and not errors:
+                errors.append(err)
+            if not errors and start_next():
+                return
+            if running == 0:
+                callback(errors[0] if errors else None, *args)
+
+        cpus = _render_cpus()
+        workers = len(cpus) if cpus else os.cpu_count() or 1
+        for _ in range(min(len(jobs), workers)):
+            start_next()
+
+    def _run_all_pages(self, s, dest_pattern, callback, *args):
+        """Generate all pages, then call callback(err, paths, *args)."""
         chunks = self._chunk_images(s)
-        paths = []
-        for i, chunk in enumerate(chunks):
-            dest = dest_pattern.format(page=i + 1)
-            self._run_montage(chunk, s, dest)
-            paths.append(dest)
-        return paths
+        paths = [dest_pattern.format(page=i + 1) for i in range(len(chunks))]
+        self._run_pages(list(zip(chunks, paths)), s, callback, paths, *args)
+
+    def _set_busy(self, busy, title=None):
+        """Lock the render buttons and show a sticky toast while rendering."""
+        for btn in (self.preview_btn, self.gen_btn, self._preview_save_btn):
+            if btn:
+                btn.set_sensitive(not busy)
+        if self._busy_toast:
+            self._busy_toast.dismiss()
+            self._busy_toast = None
+        if busy:
+            self._busy_toast = Adw.Toast(title=title, timeout=0)
+            self.toast_overlay.add_toast(self._busy_toast)
+
+    def _show_error(self, err):
+        self.toast_overlay.add_toast(Adw.Toast(title=f"Error: {err[:120]}"))
 
     def _on_preview(self, _btn):
         if not self._check_ready():
             return
-        s = self._gather_settings(dpi_override=72)
         tmpdir = tempfile.mkdtemp(prefix="photogrid_")
-        pattern = str(Path(tmpdir) / "page-{page}.png")
-        try:
-            pages = self._run_all_pages(s, pattern)
-        except subprocess.CalledProcessError as e:
-            err = e.stderr.decode("utf-8", errors="replace").strip()[:120]
-            self.toast_overlay.add_toast(Adw.Toast(title=f"Error: {err}"))
+        if self.full_preview_row.get_active():
+            # same pixels as a save, written as JPEG like the default output
+            s = self._gather_settings()
+            pattern = str(Path(tmpdir) / "page-{page}.jpg")
+        else:
+            s = self._gather_settings(dpi_override=72, preview=True)
+            pattern = str(Path(tmpdir) / "page-{page}.png")
+        self._set_busy(True, "Rendering preview\u2026")
+        # keyed now: the list can still change while the pages render
+        key = self._render_key(s)
+        self._run_all_pages(s, pattern, self._on_preview_ready, s, key, tmpdir)
+
+    def _on_preview_ready(self, err, pages, s, key, tmpdir):
+        self._set_busy(False)
+        if err:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            self._show_error(err)
             return
+        if not s["preview"]:
+            if self._render_cache:
+                shutil.rmtree(self._render_cache[2], ignore_errors=True)
+            self._render_cache = (key, pages, tmpdir)
         self._show_preview(pages)
 
+    def _render_key(self, s):
+        """Identify a render by the settings that affect its pixels + sources.
+
+        Images are keyed by (path, mtime), like thumbnails, so editing a
+        source photo forces a re-render.
+        """
+        settings = tuple(sorted((k, v) for k, v in s.items() if k != "pdf"))
+        images = []
+        for path in self.images:
+            try:
+                images.append((path, os.path.getmtime(path)))
+            except OSError:
+                images.append((path, None))
+        return settings, tuple(images)
+
+    def _cached_pages(self, s):
+        """Pages of the last full-quality preview, if s would render the same."""
+        if not self._render_cache:
+            return None
+        key, pages, _tmpdir = self._render_cache
+        if key != self._render_key(s) or not all(map(os.path.exists, pages)):
+            return None
+        return pages
+
     def _show_preview(self, pages):
         if self._preview_win:
             self._preview_win.close()
@@ -423,10 +853,10 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         self._preview_win.connect("close-request", self._on_preview_close)
 
         header = Adw.HeaderBar()
-        save_btn = Gtk.Button(label="Save As")
-        save_btn.add_css_class("suggested-action")
-        save_btn.connect("clicked", self._on_generate)
-        header.pack_end(save_btn)
+        self._preview_save_btn = Gtk.Button(label="Save As")
+        self._preview_save_btn.add_css_class("suggested-action")
+        self._preview_save_btn.connect("clicked", self._on_generate)
+        header.pack_end(self._preview_save_btn)
 
         # page navigation (only if multi-page)
         if len(pages) > 1:
@@ -443,7 +873,7 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         else:
             self._prev_btn = self._next_btn = self._page_label = None
 
-        self._preview_picture = Gtk.Picture.new_for_filename(pages[0])
+        self._preview_picture = Gtk.Picture()
         self._preview_picture.set_can_shrink(True)
         self._preview_picture.set_content_fit(Gtk.ContentFit.CONTAIN)
 
@@ -455,13 +885,14 @@ class PhotoGridWindow(Adw.ApplicationWindow):
         toolbar.set_content(scroll)
         self._preview_win.set_content(toolbar)
         self._preview_win.present()
+        self._load_preview_page()
         self._update_preview_nav()
 
     def _on_preview_nav(self, _btn, direction):
         self._preview_idx = max(
             0, min(self._preview_idx + direction, len(self._preview_pages) - 1)
         )
-        self._preview_picture.set_filename(self._preview_pages[self._preview_idx])
+        self._load_preview_page()
         self._update_preview_nav()
 
     def _update_preview_nav(self):
@@ -475,6 +906,7 @@ class PhotoGridWindow(Adw.ApplicationWindow):
 
     def _on_preview_close(self, _win):
         self._preview_win = None
+        self._preview_save_btn = None
         self._preview_pages = []
         return False
 
@@ -494,46 +926,100 @@ class PhotoGridWindow(Adw.ApplicationWindow):
             return
 
         chunks = self._chunk_images(s)
-
-        try:
-            if s["pdf"]:
-                # PDF: render all pages as temp PNGs, combine into one PDF
-                tmpdir = tempfile.mkdtemp(prefix="photogrid_pdf_")
-                pattern = str(Path(tmpdir) / "page-{page}.png")
-                page_files = self._run_all_pages(s, pattern)
-                # ensure .pdf extension
-                if not dest.lower().endswith(".pdf"):
-                    dest += ".pdf"
-                cmd = (
-                    ["magick"]
-                    + page_files
-                    + ["-units", "PixelsPerInch", "-density", str(s["dpi"]), dest]
-                )
-                subprocess.run(cmd, capture_output=True, check=True)
-                self.toast_overlay.add_toast(
-                    Adw.Toast(title=f"Saved {len(page_files)}-page PDF")
-                )
-            elif len(chunks) == 1:
-                self._run_montage(chunks[0], s, dest)
-                self.toast_overlay.add_toast(
-                    Adw.Toast(title=f"Saved to {Path(dest).name}")
-                )
+        cached = self._cached_pages(s)
+
+        if s["pdf"]:
+            # ensure .pdf extension
+            if not dest.lower().endswith(".pdf"):
+                dest += ".pdf"
+            self._set_busy(True, "Creating PDF\u2026")
+            if cached:
+                # the pages belong to the preview cache, so keep them
+                self._on_pdf_pages_ready(None, cached, s, dest, None)
+                return
+            # PDF: render all pages as temp files, combine into one PDF.
+            # img2pdf embeds JPEG pages as-is; otherwise use PNG at a fast
+            # zlib level - all pages sit in (often RAM-backed) /tmp until
+            # the combine, so they must stay compressed.
+            tmpdir = tempfile.mkdtemp(prefix="photogrid_pdf_")
+            if img2pdf:
+                page_s, ext = s, "jpg"
             else:
-                p = Path(dest)
-                stem, ext = p.stem, p.suffix or ".jpg"
-                for i, chunk in enumerate(chunks, 1):
-                    out = str(p.with_name(f"{stem}-{i}{ext}"))
-                    self._run_montage(chunk, s, out)
-                self.toast_overlay.add_toast(
-                    Adw.Toast(title=f"Saved {len(chunks)} files")
-                )
+                page_s, ext = {**s, "scratch": True}, "png"
+            pattern = str(Path(tmpdir) / f"page-{{page}}.{ext}")
+            self._run_all_pages(
+                page_s, pattern, self._on_pdf_pages_ready, s, dest, tmpdir
+            )
+            return
 
-            if self._preview_win:
-                self._preview_win.close()
-                self._preview_win = None
-        except subprocess.CalledProcessError as e:
-            err = e.stderr.decode("utf-8", errors="replace").strip()[:120]
-            self.toast_overlay.add_toast(Adw.Toast(title=f"Error: {err}"))
+        p = Path(dest)
+        if len(chunks) == 1:
+            dests = [dest]
+            msg = f"Saved to {p.name}"
+        else:
+            stem, ext = p.stem, p.suffix or ".jpg"
+            dests = [
+                str(p.with_name(f"{stem}-{i}{ext}")) for i in range(1, len(chunks) + 1)
+            ]
+            msg = f"Saved {len(chunks)} files"
+
+        if cached and p.suffix.lower() in (".jpg", ".jpeg"):
+            # the full-quality preview already rendered these pages
+            try:
+                for src, out in zip(cached, dests):
+                    shutil.copyfile(src, out)
+            except OSError as e:
+                self._on_saved(e.strerror or str(e), msg)
+                return
+            self._on_saved(None, msg)
+            return
+
+        self._set_busy(True, "Creating grid\u2026")
+        self._run_pages(list(zip(chunks, dests)), s, self._on_saved, msg)
+
+    def _on_pdf_pages_ready(self, err, page_files, s, dest, tmpdir):
+        """Combine the rendered pages; tmpdir (if any) is removed afterwards."""
+        if err:
+            self._on_saved(err, None, tmpdir)
+            return
+        msg = f"Saved {len(page_files)}-page PDF"
+        # pages are JPEG (rendered or cached) whenever img2pdf is available
+        if img2pdf:
+            args = (page_files, s["dpi"], dest, msg, tmpdir)
+            threading.Thread(target=self._write_pdf, args=args).start()
+            return
+        cmd = (
+            [self.get_application().magick_path, "-limit", "thread", "1"]
+            + page_files
+            + ["-units", "PixelsPerInch", "-density", str(s["dpi"]), dest]
+        )
+        self._spawn(cmd, self._on_saved, msg, tmpdir)
+
+    def _write_pdf(self, page_files, dpi, dest, msg, tmpdir):
+        """Wrap the page images into a PDF without re-encoding (worker thread)."""
+        layout = img2pdf.get_fixed_dpi_layout_fun((dpi, dpi))
+        try:
+            # convert before opening, so a failure leaves dest untouched
+            data = img2pdf.convert(page_files, layout_fun=layout)
+            with open(dest, "wb") as f:
+                f.write(data)
+        except Exception as e:  # img2pdf raises a variety of error types
+            GLib.idle_add(self._on_saved, str(e) or type(e).__name__, msg, tmpdir)
+            return
+        GLib.idle_add(self._on_saved, None, msg, tmpdir)
+
+    def _on_saved(self, err, msg, tmpdir=None):
+        self._set_busy(False)
+        if tmpdir:
+            # intermediate pages, at print DPI
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        if err:
+            self._show_error(err)
+            return
+        self.toast_overlay.add_toast(Adw.Toast(title=msg))
+        if self._preview_win:
+            self._preview_win.close()
+            self._preview_win = None
 
 
 # -- application ---------------------------------------------------------
@@ -544,6 +1030,8 @@ class PhotoGridApp(Adw.Application):
         super().__init__(
             application_id=APP_ID, flags=Gio.ApplicationFlags.DEFAULT_FLAGS
         )
+        # resolved once; PhotoGridWindow._check_ready re-resolves if it vanishes
+        self.magick_path = shutil.which("magick")
 
     def do_activate(self):
         Gtk.Window.set_default_icon_name("view-grid-symbolic")